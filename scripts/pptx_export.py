@@ -4,7 +4,7 @@ PPTX Export Script for Presentation Maker
 Converts HTML presentations to PowerPoint (.pptx) format with full styling support.
 
 Usage:
-    python pptx_export.py input.html [--output output.pptx]
+    python pptx_export.py input.html [--output output.pptx] [--fast-save]
 
 Features:
     - Parses HTML slide sections with CSS class detection
@@ -19,11 +19,18 @@ Features:
 
 import argparse
 import base64
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
 import io
 import os
 import re
 import sys
+import tempfile
+import zipfile
 from pathlib import Path
+from xml.sax.saxutils import quoteattr
 from urllib.parse import urlparse, unquote
 from html.parser import HTMLParser
 
@@ -33,7 +40,7 @@ try:
     from pptx.dml.color import RGBColor
     from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
     from pptx.enum.shapes import MSO_SHAPE, PP_PLACEHOLDER
-    from pptx.oxml.ns import qn
+    from pptx.oxml.ns import qn, nsdecls
     from pptx.oxml import parse_xml
 except ImportError:
     print("""
@@ -47,6 +54,113 @@ For more help: https://python-pptx.readthedocs.io/
 """)
     sys.exit(1)
 
+try:
+    from lxml import etree
+except ImportError:
+    etree = None  # Fall back to the pure-Python html.parser
+
+
+# Size of the text chunks streamed into the HTML parser
+HTML_CHUNK_SIZE = 64 * 1024
+
+# Deflate level used by --fast-save (python-pptx otherwise uses zlib's default, 6)
+FAST_SAVE_COMPRESSLEVEL = 1
+
+# Input files larger than this are streamed into the parser instead of read whole
+MAX_HTML_BYTES = 32 * 1024 * 1024
+
+# Base64 characters decoded per write; a multiple of 4 so chunks decode independently
+B64_CHUNK_SIZE = 64 * 1024
+
+# Precompiled patterns used on the parsing/color hot paths
+_RE_ROOT = re.compile(r':root\s*\{([^}]+)\}', re.DOTALL)
+_RE_CSSVAR = re.compile(r'--([^:]+):\s*([^;]+);')
+_RE_RGB = re.compile(r'rgba?\((\d+),\s*(\d+),\s*(\d+)')
+_RE_DATAURI = re.compile(r'data:image/(\w+);base64,(.+)', re.DOTALL)
+_RE_B64_NON_ALPHABET = re.compile(r'[^A-Za-z0-9+/=]+')
+_RE_COMMENT_NOTES = re.compile(r'\s*NOTES:(.*)', re.DOTALL)
+# Comments, script/style bodies, and slide <section> starts, in document order; a
+# section inside a comment or script is consumed with it and never counts as a slide
+_RE_NOTES_SCAN = re.compile(
+    r'<!--(.*?)-->'
+    r'|<(script|style)\b.*?</\2\s*>'
+    r'|(<section\b[^>]*\bclass\s*=\s*["\']?[^"\'>]*slide)',
+    re.DOTALL | re.IGNORECASE
+)
+
+# Font sizes and positions used for every slide, converted to EMU once
+_PT_6 = Pt(6)
+_PT_18 = Pt(18)
+_PT_20 = Pt(20)
+_PT_24 = Pt(24)
+_PT_40 = Pt(40)
+_PT_54 = Pt(54)
+_IN_1 = Inches(1)
+_IN_1_5 = Inches(1.5)
+_IN_2 = Inches(2)
+_IN_4 = Inches(4)
+_IN_5_5 = Inches(5.5)
+_IN_6_5 = Inches(6.5)
+_IN_7_5 = Inches(7.5)
+_IN_8 = Inches(8)
+_IN_11 = Inches(11)
+_IN_13_333 = Inches(13.333)
+
+# Slide class -> (priority, slide_type, layout); the lowest priority wins
+_CLASS_LAYOUT_MAP = {
+    'title-slide': (0, 'title', 'title_slide'),
+    'split-slide': (1, 'split', 'two_column'),
+    'two-column': (1, 'split', 'two_column'),
+    'stats-slide': (2, 'stats', 'title_content'),
+    'stats': (2, 'stats', 'title_content'),
+    'quote-slide': (3, 'quote', 'title_content'),
+    'quote': (3, 'quote', 'title_content'),
+    'image-slide': (4, 'image', 'title_content'),
+    'image-heavy': (4, 'image', 'title_content'),
+    'section-header': (5, 'section', 'section_header'),
+    'section': (5, 'section', 'section_header'),
+    'closing-slide': (6, 'closing', 'title_slide'),
+    'closing': (6, 'closing', 'title_slide'),
+    'blank': (7, 'blank', 'blank'),
+}
+_DARK_BG_CLASSES = frozenset({'title-slide', 'bg-dark', 'dark'})
+_LIGHT_BG_CLASSES = frozenset({'bg-light', 'light'})
+
+# Loose-HTML handling, mirroring libxml2 so html.parser yields the same events:
+# a start tag in _P_CLOSING_TAGS ends an open <p>, <li> ends an open <li>, and
+# ending a block ends any <p>/<li> still open inside it
+_P_CLOSING_TAGS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'div', 'dl', 'fieldset', 'figure',
+    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li',
+    'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'ul',
+})
+_BLOCK_TAGS = (_P_CLOSING_TAGS - {'hr'}) | {'body', 'html', 'td', 'th', 'tr', 'dd', 'dt'}
+_IMPLIED_END_TAGS = frozenset({'p', 'li'})
+
+# Solid background fill; %s is the RRGGBB hex value
+_BG_XML = (
+    '<p:bg %s><p:bgPr><a:solidFill><a:srgbClr val="%%s"/></a:solidFill>'
+    '<a:effectLst/></p:bgPr></p:bg>' % nsdecls('p', 'a')
+)
+
+# Paragraph default run properties: size (centipoints), bold, RRGGBB hex, typeface
+_DEF_RPR_XML = (
+    '<a:defRPr %s sz="%%d" b="%%d"><a:solidFill><a:srgbClr val="%%s"/></a:solidFill>'
+    '<a:latin typeface=%%s/></a:defRPr>' % nsdecls('a')
+)
+
+# Lowercased layout name fragments to search for, per layout type
+_LAYOUT_SEARCH_NAMES = {
+    'title_slide': ['title slide', 'title only', 'title'],
+    'title_content': ['title and content', 'title content', 'content'],
+    'section_header': ['section header', 'section'],
+    'two_column': ['two content', 'two column', 'comparison'],
+    'blank': ['blank'],
+}
+
+# Background colors that get light text when detected on a slide
+_DARK_BG_COLORS = frozenset({'#0A0A0A', '#000000', '#0f172a', '#030712'})
+
 
 class SlideParser(HTMLParser):
     """Parse HTML to extract slide content, images, and metadata"""
@@ -57,17 +171,45 @@ class SlideParser(HTMLParser):
         self.current_slide = None
         self.current_tag = None
         self.current_attrs = {}
-        self.current_data = []
+        self.current_data = io.StringIO()
         self.in_speaker_notes = False
         self.in_style = False
         self.style_content = []
         self.css_vars = {}
         self.slide_counter = 0
-        self.tag_stack = []
+        self.tag_depth = 0
+        self.open_blocks = []  # open _BLOCK_TAGS, for implied end tags
+        self.pending_notes = []  # NOTES comments seen before the first slide
         
     def handle_starttag(self, tag, attrs):
+        open_blocks = self.open_blocks
+        if open_blocks and open_blocks[-1] == 'p' and tag in _P_CLOSING_TAGS:
+            open_blocks.pop()
+            self._handle_end('p')
+        if open_blocks and open_blocks[-1] == 'li' and tag == 'li':
+            open_blocks.pop()
+            self._handle_end('li')
+        if tag in _BLOCK_TAGS:
+            open_blocks.append(tag)
+        self._handle_start(tag, attrs)
+    
+    def handle_endtag(self, tag):
+        open_blocks = self.open_blocks
+        if tag in _BLOCK_TAGS:
+            if tag in open_blocks:
+                while open_blocks[-1] != tag:
+                    top = open_blocks.pop()
+                    if top in _IMPLIED_END_TAGS:
+                        self._handle_end(top)
+                open_blocks.pop()
+            elif tag in _IMPLIED_END_TAGS:
+                # Stray </p> or </li>; libxml2 drops these too
+                return
+        self._handle_end(tag)
+    
+    def _handle_start(self, tag, attrs):
         attrs_dict = dict(attrs)
-        self.tag_stack.append((tag, attrs_dict))
+        self.tag_depth += 1
         
         # Capture style tag content for CSS parsing
         if tag == 'style':
@@ -79,52 +221,35 @@ class SlideParser(HTMLParser):
             self.slide_counter += 1
             classes = attrs_dict.get('class', '')
             
-            # Determine slide type from CSS classes
-            slide_type = 'content'
-            layout = 'title_content'
-            
-            if 'title-slide' in classes:
-                slide_type = 'title'
-                layout = 'title_slide'
-            elif 'split-slide' in classes or 'two-column' in classes:
-                slide_type = 'split'
-                layout = 'two_column'
-            elif 'stats-slide' in classes or 'stats' in classes:
-                slide_type = 'stats'
-                layout = 'title_content'
-            elif 'quote-slide' in classes or 'quote' in classes:
-                slide_type = 'quote'
-                layout = 'title_content'
-            elif 'image-slide' in classes or 'image-heavy' in classes:
-                slide_type = 'image'
+            # Determine slide type from CSS classes (one tokenize, then dict hits)
+            class_set = frozenset(classes.split())
+            matches = [_CLASS_LAYOUT_MAP[c] for c in class_set if c in _CLASS_LAYOUT_MAP]
+            if matches:
+                _, slide_type, layout = min(matches)
+            else:
+                slide_type = 'content'
                 layout = 'title_content'
-            elif 'section-header' in classes or 'section' in classes:
-                slide_type = 'section'
-                layout = 'section_header'
-            elif 'closing-slide' in classes or 'closing' in classes:
-                slide_type = 'closing'
-                layout = 'title_slide'
-            elif 'blank' in classes:
-                slide_type = 'blank'
-                layout = 'blank'
             
             self.current_slide = {
                 'number': self.slide_counter,
                 'type': slide_type,
                 'layout': layout,
                 'classes': classes,
+                'class_set': class_set,
                 'title': '',
                 'subtitle': '',
                 'content': [],
                 'images': [],
-                'speaker_notes': '',
-                'background': None
+                'speaker_notes': '\n'.join(self.pending_notes),
+                # Try to extract background from the slide's classes
+                'background': self._extract_background(class_set)
             }
+            self.pending_notes = []
         
         # Check for speaker notes div
         if tag == 'div' and 'speaker-notes' in attrs_dict.get('class', ''):
             self.in_speaker_notes = True
-            self.current_data = []
+            self.current_data = io.StringIO()
             return
         
         # Track current tag for content extraction
@@ -132,7 +257,7 @@ class SlideParser(HTMLParser):
             if tag in ['h1', 'h2', 'h3', 'p', 'li', 'strong', 'em', 'span']:
                 self.current_tag = tag
                 self.current_attrs = attrs_dict
-                self.current_data = []
+                self.current_data = io.StringIO()
             
             # Extract image src
             if tag == 'img':
@@ -146,12 +271,21 @@ class SlideParser(HTMLParser):
                     })
     
     def handle_data(self, data):
+        if not data:
+            return
+        
+        # Whitespace-only fragments (indentation between tags) are dropped unless
+        # they can land inside accumulated text; leading whitespace is stripped anyway
         if self.in_style:
-            self.style_content.append(data)
-        elif self.current_tag or self.in_speaker_notes:
-            self.current_data.append(data)
+            if self.style_content or not data.isspace():
+                self.style_content.append(data)
+        elif self.in_speaker_notes:
+            self.current_data.write(data)
+        elif self.current_tag:
+            if self.current_data.tell() or not data.isspace():
+                self.current_data.write(data)
     
-    def handle_endtag(self, tag):
+    def _handle_end(self, tag):
         # End of style tag
         if tag == 'style':
             self.in_style = False
@@ -159,19 +293,19 @@ class SlideParser(HTMLParser):
             return
         
         if not self.current_slide:
-            if self.tag_stack:
-                self.tag_stack.pop()
+            if self.tag_depth:
+                self.tag_depth -= 1
             return
         
-        content = ''.join(self.current_data).strip()
+        content = self.current_data.getvalue().strip()
         
         # Speaker notes
         if tag == 'div' and self.in_speaker_notes:
-            self.current_slide['speaker_notes'] = content
+            append_speaker_notes(self.current_slide, content)
             self.in_speaker_notes = False
-            self.current_data = []
-            if self.tag_stack:
-                self.tag_stack.pop()
+            self.current_data = io.StringIO()
+            if self.tag_depth:
+                self.tag_depth -= 1
             return
         
         # Title (H1)
@@ -213,46 +347,164 @@ class SlideParser(HTMLParser):
         
         # End of slide
         if tag == 'section' and self.current_slide:
-            # Try to extract background from inline style or CSS
-            self.current_slide['background'] = self._extract_background(self.current_slide['classes'])
             self.slides.append(self.current_slide)
             self.current_slide = None
         
         if tag == self.current_tag:
             self.current_tag = None
             self.current_attrs = {}
-            self.current_data = []
+            self.current_data = io.StringIO()
+        
+        if self.tag_depth:
+            self.tag_depth -= 1
+    
+    def handle_comment(self, data):
+        # NOTES comments only reach the parser when the HTML is streamed; otherwise
+        # extract_comment_notes strips them beforehand
+        data = data.strip()
+        if not data.startswith('NOTES:'):
+            return
+        
+        text = data[len('NOTES:'):].strip()
+        if not text:
+            return
         
-        if self.tag_stack:
-            self.tag_stack.pop()
+        # Same placement as extract_comment_notes: the enclosing or preceding slide,
+        # or the first slide for notes ahead of any slide
+        if self.current_slide:
+            append_speaker_notes(self.current_slide, text)
+        elif self.slides:
+            append_speaker_notes(self.slides[-1], text)
+        else:
+            self.pending_notes.append(text)
     
     def _extract_css_variables(self, css_content):
         """Extract CSS variables from style content"""
         vars_dict = {}
         
+        # Cheap substring scan first; most style blocks have no :root
+        if not css_content or css_content.find(':root') == -1:
+            return vars_dict
+        
         # Match :root CSS variables
-        root_pattern = r':root\s*\{([^}]+)\}'
-        root_match = re.search(root_pattern, css_content, re.DOTALL)
+        root_match = _RE_ROOT.search(css_content)
         
         if root_match:
             root_content = root_match.group(1)
-            var_pattern = r'--([^:]+):\s*([^;]+);'
-            for match in re.finditer(var_pattern, root_content):
+            for match in _RE_CSSVAR.finditer(root_content):
                 var_name = match.group(1).strip()
                 var_value = match.group(2).strip()
                 vars_dict[var_name] = var_value
         
         return vars_dict
     
-    def _extract_background(self, classes):
+    def _extract_background(self, class_set):
         """Try to determine background color from common class patterns"""
-        if 'title-slide' in classes or 'bg-dark' in classes or 'dark' in classes:
+        if not class_set.isdisjoint(_DARK_BG_CLASSES):
             return '#0A0A0A'
-        if 'bg-light' in classes or 'light' in classes:
+        if not class_set.isdisjoint(_LIGHT_BG_CLASSES):
             return '#ffffff'
         return None
 
 
+class SlideTarget:
+    """lxml parser target that forwards C-level parse events to a SlideParser"""
+    
+    def __init__(self, slide_parser):
+        self.slide_parser = slide_parser
+    
+    def start(self, tag, attrib):
+        self.slide_parser.handle_starttag(tag, list(attrib.items()))
+    
+    def end(self, tag):
+        self.slide_parser.handle_endtag(tag)
+    
+    def data(self, data):
+        self.slide_parser.handle_data(data)
+    
+    def comment(self, text):
+        self.slide_parser.handle_comment(text)
+    
+    def close(self):
+        return self.slide_parser
+
+
+def parse_slides(chunks):
+    """Feed HTML text chunks through lxml (or html.parser) and return the SlideParser"""
+    slide_parser = SlideParser()
+    
+    if etree is None:
+        for chunk in chunks:
+            slide_parser.feed(chunk)
+        slide_parser.close()
+        return slide_parser
+    
+    # huge_tree lifts libxml2's size limits for large embedded data URIs
+    parser = etree.HTMLParser(target=SlideTarget(slide_parser), huge_tree=True)
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
+
+
+def extract_comment_notes(html_content):
+    """Strip <!-- NOTES: ... --> comments from HTML before parsing
+    
+    Returns the stripped HTML and a list of (slide_index, notes_text) pairs. A note
+    belongs to the slide whose <section> precedes it (the first slide if none does).
+    """
+    if 'NOTES:' not in html_content:
+        return html_content, []
+    
+    pieces = []
+    notes = []
+    last = 0
+    slide_index = -1
+    for match in _RE_NOTES_SCAN.finditer(html_content):
+        if match.group(3):
+            slide_index += 1
+            continue
+        
+        comment = match.group(1)
+        note = _RE_COMMENT_NOTES.match(comment) if comment is not None else None
+        if not note:
+            continue
+        
+        pieces.append(html_content[last:match.start()])
+        last = match.end()
+        text = note.group(1).strip()
+        if text:
+            notes.append((max(slide_index, 0), text))
+    
+    if not pieces:
+        return html_content, []
+    
+    pieces.append(html_content[last:])
+    return ''.join(pieces), notes
+
+
+def parse_html(html_content):
+    """Parse a full HTML document, including speaker notes kept in HTML comments"""
+    html_content, comment_notes = extract_comment_notes(html_content)
+    slide_parser = parse_slides([html_content])
+    
+    slides = slide_parser.slides
+    for slide_index, text in comment_notes:
+        if slide_index < len(slides):
+            append_speaker_notes(slides[slide_index], text)
+    return slide_parser
+
+
+def append_speaker_notes(slide, text):
+    """Add text to a slide's speaker notes, one block per line"""
+    if not text:
+        return
+    if slide['speaker_notes']:
+        slide['speaker_notes'] += '\n' + text
+    else:
+        slide['speaker_notes'] = text
+
+
+@functools.lru_cache(maxsize=256)
 def hex_to_rgb(hex_color):
     """Convert hex color to RGB tuple"""
     if not hex_color:
@@ -268,31 +520,27 @@ def hex_to_rgb(hex_color):
         return (255, 255, 255)
 
 
-def rgb_color_from_hex(hex_color):
-    """Create RGBColor from hex string"""
-    rgb = hex_to_rgb(hex_color)
-    return RGBColor(rgb[0], rgb[1], rgb[2])
-
-
-def parse_color(color_value):
-    """Parse various color formats to RGBColor"""
+@functools.lru_cache(maxsize=256)
+def _parse_color_to_rgb_tuple(color_value):
+    """Parse various color formats to an (r, g, b) tuple"""
     if not color_value:
-        return RGBColor(255, 255, 255)
+        return (255, 255, 255)
     
     color_value = color_value.strip()
     
     # Hex color
     if color_value.startswith('#'):
-        return rgb_color_from_hex(color_value)
+        return hex_to_rgb(color_value)
     
     # RGB/RGBA
-    rgb_match = re.match(r'rgba?\((\d+),\s*(\d+),\s*(\d+)', color_value)
-    if rgb_match:
-        return RGBColor(
-            int(rgb_match.group(1)),
-            int(rgb_match.group(2)),
-            int(rgb_match.group(3))
-        )
+    if color_value.startswith('rgb'):
+        rgb_match = _RE_RGB.match(color_value)
+        if rgb_match:
+            return (
+                int(rgb_match.group(1)),
+                int(rgb_match.group(2)),
+                int(rgb_match.group(3))
+            )
     
     # Named colors (common ones)
     named_colors = {
@@ -304,28 +552,30 @@ def parse_color(color_value):
         'transparent': '#ffffff',
     }
     if color_value.lower() in named_colors:
-        return rgb_color_from_hex(named_colors[color_value.lower()])
+        return hex_to_rgb(named_colors[color_value.lower()])
     
-    return RGBColor(255, 255, 255)
+    return (255, 255, 255)
 
 
-def get_or_create_layout(prs, layout_name):
-    """Get a slide layout by name, or return a suitable default"""
-    layout_mapping = {
-        'title_slide': ['Title Slide', 'Title Only', 'title'],
-        'title_content': ['Title and Content', 'Title Content', 'content'],
-        'section_header': ['Section Header', 'Section', 'section'],
-        'two_column': ['Two Content', 'Two Column', 'Comparison', 'comparison'],
-        'blank': ['Blank', 'blank'],
-    }
+def parse_color(color_value):
+    """Parse various color formats to RGBColor"""
+    return RGBColor(*_parse_color_to_rgb_tuple(color_value))
+
+
+def get_or_create_layout(prs, layout_name, layouts_lc=None):
+    """Get a slide layout by name, or return a suitable default
+    
+    layouts_lc is an optional precomputed list of (layout, lowercased name) pairs.
+    """
+    if layouts_lc is None:
+        layouts_lc = [(layout, layout.name.lower()) for layout in prs.slide_layouts]
     
-    search_names = layout_mapping.get(layout_name, [layout_name])
+    search_names = _LAYOUT_SEARCH_NAMES.get(layout_name, [layout_name.lower()])
     
     # Try to find matching layout
-    for layout in prs.slide_layouts:
-        layout_name_lower = layout.name.lower()
+    for layout, layout_name_lower in layouts_lc:
         for search in search_names:
-            if search.lower() in layout_name_lower:
+            if search in layout_name_lower:
                 return layout
     
     # Fallback to index-based selection
@@ -341,16 +591,33 @@ def get_or_create_layout(prs, layout_name):
         return prs.slide_layouts[-1] if prs.slide_layouts else prs.slide_layouts[0]
 
 
+def get_placeholder_indices(layout):
+    """Find (title_idx, subtitle_idx, content_idx) among the placeholders a slide inherits from a layout"""
+    title_idx = subtitle_idx = content_idx = None
+    
+    for shape in layout.iter_cloneable_placeholders():
+        ph_format = shape.placeholder_format
+        if ph_format.idx == 0:
+            title_idx = 0
+        if subtitle_idx is None and ph_format.type == 2:  # SUBTITLE
+            subtitle_idx = ph_format.idx
+        # BODY, OBJECT, VERTICAL_BODY, VERTICAL_OBJECT
+        if content_idx is None and ph_format.type in [1, 12, 13, 14, 15]:
+            content_idx = ph_format.idx
+    
+    return title_idx, subtitle_idx, content_idx
+
+
 def set_slide_background(slide, color):
-    """Set solid background color for a slide"""
+    """Set solid background color for a slide (or slide layout)"""
     if not color:
         return
     
     try:
-        background = slide.background
-        fill = background.fill
-        fill.solid()
-        fill.fore_color.rgb = parse_color(color)
+        # Write the <p:bg> element directly rather than through fill property setters
+        c_sld = slide._element.cSld
+        c_sld._remove_bg()
+        c_sld._insert_bg(parse_xml(_BG_XML % str(parse_color(color))))
     except Exception as e:
         print(f"Warning: Could not set background color: {e}")
 
@@ -359,11 +626,11 @@ def add_image_to_slide(slide, img_path, left=None, top=None, width=None, height=
     """Add an image to a slide with optional positioning"""
     try:
         if left is None:
-            left = Inches(8)
+            left = _IN_8
         if top is None:
-            top = Inches(1.5)
+            top = _IN_1_5
         if height is None and width is None:
-            height = Inches(4)
+            height = _IN_4
         
         return slide.shapes.add_picture(img_path, left, top, width=width, height=height)
     except Exception as e:
@@ -380,16 +647,24 @@ def resolve_image_path(src, html_dir):
     if src.startswith('data:'):
         try:
             # Parse data URI
-            match = re.match(r'data:image/(\w+);base64,(.+)', src)
+            match = _RE_DATAURI.match(src)
             if match:
                 ext = match.group(1)
-                data = match.group(2)
-                img_data = base64.b64decode(data)
                 
-                # Create temp file
-                temp_path = os.path.join(html_dir, f'_temp_image.{ext}')
-                with open(temp_path, 'wb') as f:
-                    f.write(img_data)
+                # Unique temp file per image; repeats are reused via the caller's cache
+                fd, temp_path = tempfile.mkstemp(prefix='_temp_image_', suffix=f'.{ext}', dir=html_dir)
+                
+                # Decode and write in chunks instead of holding the whole image in memory
+                # Drop everything b64decode would skip, so every chunk stays 4-char aligned
+                data = _RE_B64_NON_ALPHABET.sub('', match.group(2))
+                try:
+                    for start in range(0, len(data), B64_CHUNK_SIZE):
+                        os.write(fd, base64.b64decode(data[start:start + B64_CHUNK_SIZE]))
+                except Exception:
+                    os.close(fd)
+                    os.unlink(temp_path)
+                    raise
+                os.close(fd)
                 return temp_path
         except Exception as e:
             print(f"Warning: Could not decode data URI: {e}")
@@ -405,52 +680,110 @@ def resolve_image_path(src, html_dir):
         # Absolute from root - try relative to html_dir
         src = src.lstrip('/')
     
-    img_path = os.path.join(html_dir, src)
-    if os.path.exists(img_path):
-        return img_path
-    
-    # Try common variations
-    variations = [
+    # Direct path first, then common variations (duplicates checked once)
+    basename = os.path.basename(src)
+    candidates = [
         src,
         src.lstrip('./'),
-        os.path.basename(src),
-        os.path.join('assets', os.path.basename(src)),
-        os.path.join('images', os.path.basename(src)),
+        basename,
+        os.path.join('assets', basename),
+        os.path.join('images', basename),
     ]
     
-    for var in variations:
+    for var in dict.fromkeys(candidates):
         test_path = os.path.join(html_dir, var)
-        if os.path.exists(test_path):
+        if _file_exists(test_path):
             return test_path
     
     return None
 
 
-def apply_text_formatting(text_frame, color, font_size=18, bold=False, font_name='Arial'):
-    """Apply consistent formatting to a text frame"""
+@functools.lru_cache(maxsize=128)
+def _list_files(directory):
+    """(file names, casefolded) for a directory, listed once per run
+    
+    Names are casefolded when the directory sits on a case-insensitive volume.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            names = frozenset(entry.name for entry in entries if entry.is_file())
+    except OSError:
+        return frozenset(), False
+    
+    # One stat per directory: does a differently cased name resolve to a listed file?
+    for name in names:
+        swapped = name.swapcase()
+        if swapped != name and swapped not in names:
+            if os.path.exists(os.path.join(directory, swapped)):
+                return frozenset(n.casefold() for n in names), True
+            break
+    return names, False
+
+
+def _file_exists(path):
+    """Check for a file via the cached listing of its directory instead of a stat call"""
+    directory, name = os.path.split(path)
+    names, casefolded = _list_files(os.path.normpath(directory))
+    return (name.casefold() if casefolded else name) in names
+
+
+def image_cache_key(src):
+    """Key for sharing a resolved image between slides (a short hash for data URIs)"""
+    if src.startswith('data:'):
+        return hashlib.blake2b(src.encode(), digest_size=16).hexdigest()
+    return src
+
+
+def apply_text_formatting(text_frame, color, font_size=_PT_18, bold=False, font_name='Arial'):
+    """Apply consistent formatting to a text frame (font_size is a Length, e.g. Pt(18))"""
     try:
+        # Runs carry the rendered formatting, so set it there only once
         for paragraph in text_frame.paragraphs:
-            paragraph.font.size = Pt(font_size)
-            paragraph.font.name = font_name
-            paragraph.font.color.rgb = color
-            paragraph.font.bold = bold
-            
             for run in paragraph.runs:
-                run.font.size = Pt(font_size)
-                run.font.name = font_name
-                run.font.color.rgb = color
-                run.font.bold = bold
+                font = run.font
+                font.size = font_size
+                font.name = font_name
+                font.color.rgb = color
+                font.bold = bold
     except Exception as e:
         print(f"Warning: Could not apply text formatting: {e}")
 
 
-def create_presentation(slides, css_vars, output_path, html_dir, verbose=False):
+class _FastZipFile(zipfile.ZipFile):
+    """ZipFile that deflates at FAST_SAVE_COMPRESSLEVEL unless a level is given"""
+    
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('compresslevel', FAST_SAVE_COMPRESSLEVEL)
+        super().__init__(*args, **kwargs)
+
+
+@contextlib.contextmanager
+def fast_zip_compression():
+    """Make zip archives written inside the block favour speed over size"""
+    original = zipfile.ZipFile
+    zipfile.ZipFile = _FastZipFile
+    try:
+        yield
+    finally:
+        zipfile.ZipFile = original
+
+
+def set_paragraph_font(paragraph, color, font_size, bold, font_name):
+    """Set a paragraph's font by writing its <a:defRPr> directly (font_size is a Length)"""
+    pPr = paragraph._p.get_or_add_pPr()
+    pPr._remove_defRPr()
+    pPr._insert_defRPr(parse_xml(
+        _DEF_RPR_XML % (font_size.centipoints, bold, str(color), quoteattr(font_name))
+    ))
+
+
+def create_presentation(slides, css_vars, output_path, html_dir, verbose=False, fast_save=False):
     """Create a PowerPoint presentation from parsed slides"""
     
     # Create presentation with 16:9 aspect ratio
     prs = Presentation()
-    prs.slide_width = Inches(13.333)  # 16:9 widescreen
-    prs.slide_height = Inches(7.5)
+    prs.slide_width = _IN_13_333  # 16:9 widescreen
+    prs.slide_height = _IN_7_5
     
     # Extract colors from CSS variables with fallbacks
     bg_primary = css_vars.get('bg-primary', '#ffffff')
@@ -459,177 +792,216 @@ def create_presentation(slides, css_vars, output_path, html_dir, verbose=False):
     text_on_dark = css_vars.get('text-on-dark', '#ffffff')
     accent = css_vars.get('accent', '#00E3AA')
     
+    # Parse theme colors once rather than per slide
+    text_primary_rgb = parse_color(text_primary)
+    text_on_dark_rgb = parse_color(text_on_dark)
+    accent_rgb = parse_color(accent)
+    theme = {
+        'dark': (bg_dark, text_on_dark_rgb),
+        'light': (bg_primary, text_primary_rgb),
+    }
+    
     # Font preferences from CSS
     font_display = css_vars.get('font-display', 'Arial').replace("'", "").replace('"', '')
     font_body = css_vars.get('font-body', 'Arial').replace("'", "").replace('"', '')
     
+    # Directory listings are cached per run; files may have changed since the last one
+    _list_files.cache_clear()
+    
     temp_files = []  # Track temp files for cleanup
+    layouts_lc = [(layout, layout.name.lower()) for layout in prs.slide_layouts]
+    layout_cache = {}  # layout name -> (slide layout, placeholder indices)
+    resolved_image_cache = {}  # image src (hash for data URIs) -> resolved path or None
+    layout_bg_colors = {}  # id(layout) -> background color set on that layout
     
-    for i, slide_data in enumerate(slides):
-        if verbose:
-            print(f"  Processing slide {i+1}/{len(slides)}: {slide_data['type']} - {slide_data['title'][:40]}...")
-        
-        # Determine colors based on slide type/background
-        if slide_data['type'] in ['title', 'section', 'closing'] or 'dark' in slide_data['classes']:
-            bg_color = bg_dark
-            text_color = text_on_dark
+    # Resolve every distinct image up front. Writing decoded data URIs to disk and
+    # any stat fallbacks release the GIL, so a thread pool overlaps that I/O across
+    # images; base64 decoding itself still holds the GIL.
+    image_keys = []  # per slide, the cache key of each image
+    pending_images = {}  # cache key -> src still to resolve
+    for slide_data in slides:
+        keys = []
+        for img_data in slide_data['images']:
+            src = img_data['src']
+            cache_key = image_cache_key(src)
+            keys.append(cache_key)
+            pending_images.setdefault(cache_key, src)
+        image_keys.append(keys)
+    
+    if pending_images:
+        srcs = list(pending_images.values())
+        if len(srcs) == 1:
+            paths = [resolve_image_path(srcs[0], html_dir)]
         else:
-            bg_color = bg_primary
-            text_color = text_primary
+            with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                paths = list(executor.map(resolve_image_path, srcs, [html_dir] * len(srcs)))
+        for cache_key, src, img_path in zip(pending_images, srcs, paths):
+            resolved_image_cache[cache_key] = img_path
+            if img_path and src.startswith('data:'):
+                temp_files.append(img_path)
+    
+    try:
+        for i, slide_data in enumerate(slides):
+            if verbose:
+                print(f"  Processing slide {i+1}/{len(slides)}: {slide_data['type']} - {slide_data['title'][:40]}...")
         
-        # Override if specific background was detected
-        if slide_data['background']:
-            bg_color = slide_data['background']
-            text_color = text_on_dark if bg_color in ['#0A0A0A', '#000000', '#0f172a', '#030712'] else text_primary
+            # Determine colors based on slide type/background
+            if slide_data['type'] in ['title', 'section', 'closing'] or 'dark' in slide_data['class_set']:
+                bg_color, text_rgb = theme['dark']
+            else:
+                bg_color, text_rgb = theme['light']
         
-        # Get appropriate layout
-        layout = get_or_create_layout(prs, slide_data['layout'])
+            # Override if specific background was detected
+            if slide_data['background']:
+                bg_color = slide_data['background']
+                text_rgb = text_on_dark_rgb if bg_color in _DARK_BG_COLORS else text_primary_rgb
         
-        # Add slide
-        slide = prs.slides.add_slide(layout)
+            # Get appropriate layout and its placeholder indices (resolved once per layout name)
+            cached = layout_cache.get(slide_data['layout'])
+            if cached is None:
+                layout = get_or_create_layout(prs, slide_data['layout'], layouts_lc)
+                cached = layout_cache[slide_data['layout']] = (layout, get_placeholder_indices(layout))
+            layout, (title_idx, subtitle_idx, content_idx) = cached
         
-        # Set background color
-        set_slide_background(slide, bg_color)
+            # Add slide
+            slide = prs.slides.add_slide(layout)
         
-        # Convert colors
-        text_rgb = parse_color(text_color)
-        accent_rgb = parse_color(accent)
+            # Set background color. The first slide on a layout puts it on the layout, so
+            # later slides with the same color inherit it instead of writing their own.
+            layout_bg = layout_bg_colors.get(id(layout))
+            if layout_bg is None:
+                set_slide_background(layout, bg_color)
+                layout_bg_colors[id(layout)] = bg_color
+            elif layout_bg != bg_color:
+                set_slide_background(slide, bg_color)
         
-        # Add title
-        if slide.shapes.title and slide_data['title']:
-            title = slide.shapes.title
-            title.text = slide_data['title']
+            # Add title
+            if title_idx is not None and slide_data['title']:
+                title = slide.placeholders[title_idx]
+                title.text = slide_data['title']
             
-            # Title slide gets larger font
-            title_size = 54 if slide_data['type'] == 'title' else 40
-            apply_text_formatting(title.text_frame, text_rgb, title_size, bold=True, font_name=font_display)
+                # Title slide gets larger font
+                title_size = _PT_54 if slide_data['type'] == 'title' else _PT_40
+                apply_text_formatting(title.text_frame, text_rgb, title_size, bold=True, font_name=font_display)
             
-            # Center align title on title slides
-            if slide_data['type'] == 'title':
-                for paragraph in title.text_frame.paragraphs:
-                    paragraph.alignment = PP_ALIGN.CENTER
-        
-        # Add subtitle (title slides)
-        if slide_data['type'] in ['title', 'closing'] and slide_data['subtitle']:
-            # Try to find subtitle placeholder
-            for shape in slide.placeholders:
-                if hasattr(shape, 'placeholder_format') and shape.placeholder_format.type == 2:  # SUBTITLE
+                # Center align title on title slides
+                if slide_data['type'] == 'title':
+                    for paragraph in title.text_frame.paragraphs:
+                        paragraph.alignment = PP_ALIGN.CENTER
+        
+            # Add subtitle (title slides)
+            if slide_data['type'] in ['title', 'closing'] and slide_data['subtitle']:
+                if subtitle_idx is not None:
+                    shape = slide.placeholders[subtitle_idx]
                     shape.text = slide_data['subtitle']
-                    apply_text_formatting(shape.text_frame, text_rgb, 24, font_name=font_body)
+                    apply_text_formatting(shape.text_frame, text_rgb, _PT_24, font_name=font_body)
                     for paragraph in shape.text_frame.paragraphs:
                         paragraph.alignment = PP_ALIGN.CENTER
-                    break
-        
-        # Add content
-        if slide_data['content']:
-            # Find the content placeholder
-            content_placeholder = None
-            for shape in slide.placeholders:
-                if hasattr(shape, 'placeholder_format'):
-                    ph_type = shape.placeholder_format.type
-                    # BODY, OBJECT, VERTICAL_BODY, VERTICAL_OBJECT
-                    if ph_type in [1, 12, 13, 14, 15]:
-                        content_placeholder = shape
-                        break
+        
+            # Add content
+            if slide_data['content']:
+                # Content placeholder, if the layout has one
+                content_placeholder = None
+                if content_idx is not None:
+                    content_placeholder = slide.placeholders[content_idx]
             
-            if content_placeholder:
-                tf = content_placeholder.text_frame
-                tf.clear()
+                if content_placeholder:
+                    tf = content_placeholder.text_frame
+                    tf.clear()
                 
-                for j, item in enumerate(slide_data['content']):
-                    if j == 0:
-                        p = tf.paragraphs[0]
-                    else:
-                        p = tf.add_paragraph()
-                    
-                    p.text = item['text']
-                    p.font.color.rgb = text_rgb
-                    p.font.size = Pt(20) if item['type'] == 'heading' else Pt(18)
-                    p.font.name = font_display if item['type'] == 'heading' else font_body
-                    p.font.bold = item['type'] == 'heading'
-                    
-                    if item['type'] == 'bullet':
-                        p.level = 0
-                    elif item['type'] == 'heading':
-                        p.level = 0
-                        p.space_after = Pt(6)
-                    else:
-                        p.level = 0
-            else:
-                # No placeholder found, add text box manually
-                if slide_data['content']:
-                    left = Inches(1)
-                    top = Inches(2)
-                    width = Inches(11)
-                    height = Inches(4)
-                    
-                    textbox = slide.shapes.add_textbox(left, top, width, height)
-                    tf = textbox.text_frame
-                    tf.word_wrap = True
-                    
                     for j, item in enumerate(slide_data['content']):
                         if j == 0:
                             p = tf.paragraphs[0]
                         else:
                             p = tf.add_paragraph()
-                        
+                    
                         p.text = item['text']
-                        p.font.color.rgb = text_rgb
-                        p.font.size = Pt(20) if item['type'] == 'heading' else Pt(18)
-                        p.font.name = font_display if item['type'] == 'heading' else font_body
-                        p.font.bold = item['type'] == 'heading'
-        
-        # Add images
-        if slide_data['images']:
-            for img_data in slide_data['images']:
-                img_path = resolve_image_path(img_data['src'], html_dir)
-                
-                if img_path:
-                    try:
-                        # Determine positioning based on slide type
-                        if slide_data['type'] == 'image' or slide_data['layout'] == 'two_column':
-                            # Image takes right half
-                            left = Inches(6.5)
-                            top = Inches(1)
-                            height = Inches(5.5)
-                        elif slide_data['type'] == 'title':
-                            # Logo/accent image, smaller
-                            left = Inches(5.5)
-                            top = Inches(5.5)
-                            height = Inches(1.5)
+                        if item['type'] == 'heading':
+                            set_paragraph_font(p, text_rgb, _PT_20, True, font_display)
                         else:
-                            # Default right-side placement
-                            left = Inches(8)
-                            top = Inches(1.5)
-                            height = Inches(4)
+                            set_paragraph_font(p, text_rgb, _PT_18, False, font_body)
+                    
+                        if item['type'] == 'bullet':
+                            p.level = 0
+                        elif item['type'] == 'heading':
+                            p.level = 0
+                            p.space_after = _PT_6
+                        else:
+                            p.level = 0
+                else:
+                    # No placeholder found, add text box manually
+                    if slide_data['content']:
+                        left = _IN_1
+                        top = _IN_2
+                        width = _IN_11
+                        height = _IN_4
+                    
+                        textbox = slide.shapes.add_textbox(left, top, width, height)
+                        tf = textbox.text_frame
+                        tf.word_wrap = True
+                    
+                        for j, item in enumerate(slide_data['content']):
+                            if j == 0:
+                                p = tf.paragraphs[0]
+                            else:
+                                p = tf.add_paragraph()
                         
-                        pic = add_image_to_slide(slide, img_path, left=left, top=top, height=height)
+                            p.text = item['text']
+                            if item['type'] == 'heading':
+                                set_paragraph_font(p, text_rgb, _PT_20, True, font_display)
+                            else:
+                                set_paragraph_font(p, text_rgb, _PT_18, False, font_body)
+        
+            # Add images
+            if slide_data['images']:
+                for img_data, cache_key in zip(slide_data['images'], image_keys[i]):
+                    img_path = resolved_image_cache[cache_key]
+                
+                    if img_path:
+                        try:
+                            # Determine positioning based on slide type
+                            if slide_data['type'] == 'image' or slide_data['layout'] == 'two_column':
+                                # Image takes right half
+                                left = _IN_6_5
+                                top = _IN_1
+                                height = _IN_5_5
+                            elif slide_data['type'] == 'title':
+                                # Logo/accent image, smaller
+                                left = _IN_5_5
+                                top = _IN_5_5
+                                height = _IN_1_5
+                            else:
+                                # Default right-side placement
+                                left = _IN_8
+                                top = _IN_1_5
+                                height = _IN_4
                         
-                        if pic and img_path.startswith(os.path.join(html_dir, '_temp')):
-                            temp_files.append(img_path)
-                            
-                    except Exception as e:
-                        print(f"Warning: Could not add image {img_data['src']}: {e}")
-        
-        # Add speaker notes
-        if slide_data['speaker_notes']:
-            try:
-                notes_slide = slide.notes_slide
-                notes_text_frame = notes_slide.notes_text_frame
-                notes_text_frame.text = slide_data['speaker_notes']
-            except Exception as e:
-                if verbose:
-                    print(f"Warning: Could not add speaker notes: {e}")
-    
-    # Clean up temp files
-    for temp_file in temp_files:
-        try:
-            os.remove(temp_file)
-        except:
-            pass
+                            add_image_to_slide(slide, img_path, left=left, top=top, height=height)
+                        
+                        except Exception as e:
+                            print(f"Warning: Could not add image {img_data['src']}: {e}")
+        
+            # Add speaker notes
+            if slide_data['speaker_notes']:
+                try:
+                    notes_slide = slide.notes_slide
+                    notes_text_frame = notes_slide.notes_text_frame
+                    notes_text_frame.text = slide_data['speaker_notes']
+                except Exception as e:
+                    if verbose:
+                        print(f"Warning: Could not add speaker notes: {e}")
     
-    # Save presentation
-    prs.save(output_path)
+        # Save presentation
+        if fast_save:
+            with fast_zip_compression():
+                prs.save(output_path)
+        else:
+            prs.save(output_path)
+    finally:
+        # Clean up temp files, even when building or saving fails
+        for temp_file in temp_files:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_file)
     return output_path
 
 
@@ -641,11 +1013,14 @@ def main():
 Examples:
     python pptx_export.py presentation.html
     python pptx_export.py presentation.html -o output.pptx -v
+    python pptx_export.py presentation.html --fast-save
         """
     )
     parser.add_argument('input', help='Input HTML file path')
     parser.add_argument('--output', '-o', help='Output PPTX file path (optional)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
+    parser.add_argument('--fast-save', action='store_true',
+                        help='Save with faster, lighter ZIP compression (larger file)')
     
     args = parser.parse_args()
     
@@ -670,17 +1045,17 @@ Examples:
     print(f"📄 Input: {input_path.absolute()}")
     print(f"📊 Output: {output_path.absolute()}")
     
-    # Read HTML file
+    # Read and parse HTML file; very large files are streamed into the parser in chunks
     try:
-        with open(input_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
+        if input_path.stat().st_size > MAX_HTML_BYTES:
+            with open(input_path, 'r', encoding='utf-8', errors='replace') as f:
+                parser = parse_slides(iter(lambda: f.read(HTML_CHUNK_SIZE), ''))
+        else:
+            parser = parse_html(input_path.read_text(encoding='utf-8', errors='replace'))
     except Exception as e:
         print(f"❌ Error reading input file: {e}")
         sys.exit(1)
     
-    # Parse slides
-    parser = SlideParser()
-    parser.feed(html_content)
     slides = parser.slides
     css_vars = parser.css_vars
     
@@ -699,7 +1074,7 @@ Examples:
     # Create presentation
     try:
         html_dir = str(input_path.parent)
-        create_presentation(slides, css_vars, str(output_path), html_dir, args.verbose)
+        create_presentation(slides, css_vars, str(output_path), html_dir, args.verbose, args.fast_save)
         
         file_size = output_path.stat().st_size
         print(f"✅ Successfully created: {output_path}")
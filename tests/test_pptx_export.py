@@ -0,0 +1,105 @@
+import base64
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import pptx_export  # noqa: E402
+
+
+def notes_of(parser):
+    return [slide['speaker_notes'] for slide in parser.slides]
+
+
+def test_comment_notes_skip_commented_out_slide():
+    html = (
+        '<section class="slide"><h1>One</h1><!-- NOTES: note for one --></section>'
+        '<!-- <section class="slide">old</section> -->'
+        '<section class="slide"><h1>Two</h1><!-- NOTES: note for two --></section>'
+        '<section class="slide"><h1>Three</h1><!-- NOTES: note for three --></section>'
+    )
+    expected = ['note for one', 'note for two', 'note for three']
+
+    assert notes_of(pptx_export.parse_html(html)) == expected
+    # The streaming path places notes from parser comment events
+    assert notes_of(pptx_export.parse_slides([html])) == expected
+
+
+def test_image_lookup_on_case_insensitive_volume(tmp_path, monkeypatch):
+    (tmp_path / 'assets').mkdir()
+    (tmp_path / 'assets' / 'logo.png').write_bytes(b'png')
+    real_exists = os.path.exists
+    stats = []
+
+    def case_insensitive_exists(path):
+        stats.append(path)
+        directory, name = os.path.split(path)
+        return real_exists(path) or any(
+            entry.lower() == name.lower() for entry in os.listdir(directory)
+        )
+
+    monkeypatch.setattr(os.path, 'exists', case_insensitive_exists)
+    pptx_export._list_files.cache_clear()
+
+    found = pptx_export.resolve_image_path('assets/Logo.png', str(tmp_path))
+    assert found == os.path.join(str(tmp_path), 'assets', 'Logo.png')
+
+    # Misses are answered from the listing; only the one-off case probe stats
+    stats.clear()
+    for i in range(10):
+        assert pptx_export.resolve_image_path(f'missing-{i}.png', str(tmp_path)) is None
+    assert stats == []
+
+
+def test_image_listing_cache_is_cleared_per_run(tmp_path):
+    image = tmp_path / 'logo.png'
+    image.write_bytes(b'png')
+    pptx_export._list_files.cache_clear()
+    assert pptx_export.resolve_image_path('logo.png', str(tmp_path))
+
+    image.unlink()
+    pptx_export.create_presentation([], {}, str(tmp_path / 'out.pptx'), str(tmp_path))
+    assert pptx_export.resolve_image_path('logo.png', str(tmp_path)) is None
+
+
+LOOSE_HTML_CASES = [
+    # <div> inside <p> implicitly ends the paragraph
+    (
+        '<section class="slide"><h1>T</h1><p>para <div>inner</div> tail</p></section>',
+        [{'type': 'text', 'text': 'para'}],
+    ),
+    # Unclosed <p> elements end at the next <p> and at </section>
+    (
+        '<section class="slide"><h1>T</h1><p>one<p>two</section>',
+        [{'type': 'text', 'text': 'one'}, {'type': 'text', 'text': 'two'}],
+    ),
+    # Unclosed <li> elements end at the next <li> and at </ul>
+    (
+        '<section class="slide"><h1>T</h1><ul><li>a<li>b</ul></section>',
+        [{'type': 'bullet', 'text': 'a'}, {'type': 'bullet', 'text': 'b'}],
+    ),
+]
+
+
+def parse_content(html, use_lxml, monkeypatch):
+    if not use_lxml:
+        monkeypatch.setattr(pptx_export, 'etree', None)
+    return pptx_export.parse_slides([html]).slides[0]['content']
+
+
+@pytest.mark.parametrize('use_lxml', [True, False], ids=['lxml', 'html.parser'])
+@pytest.mark.parametrize('html,expected', LOOSE_HTML_CASES)
+def test_loose_html_parity(html, expected, use_lxml, monkeypatch):
+    assert parse_content(html, use_lxml, monkeypatch) == expected
+
+
+def test_data_uri_with_stray_characters_decodes_across_chunks(tmp_path):
+    raw = bytes(range(256)) * 400  # ~100KB, several decode chunks
+    encoded = base64.b64encode(raw).decode()
+    payload = encoded[:1000] + '!' + encoded[1000:50000] + '\n ' + encoded[50000:]
+
+    path = pptx_export.resolve_image_path(f'data:image/png;base64,{payload}', str(tmp_path))
+    with open(path, 'rb') as f:
+        assert f.read() == raw